@@ -0,0 +1,82 @@
+import os
+import re
+import sys
+import time
+import tracemalloc
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import psutil
+import extractors
+
+RUNS = int(os.getenv("BENCH_RUNS", "5"))
+
+
+def count_pages(file_path):
+    ext = os.path.splitext(file_path)[-1].lower()
+    if ext == '.pdf' and extractors.pymupdf:
+        with extractors.pymupdf.open(file_path) as doc:
+            return doc.page_count
+    if ext == '.pdf' and extractors.pdfplumber:
+        with extractors.pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    if ext == '.docx':
+        # Word stores the page count from the last save in docProps/app.xml
+        with zipfile.ZipFile(file_path) as z:
+            if "docProps/app.xml" in z.namelist():
+                match = re.search(rb"<Pages>(\d+)</Pages>", z.read("docProps/app.xml"))
+                if match:
+                    return int(match.group(1))
+    return 1
+
+
+def run_backend(file_path, backend):
+    # Runs in a fresh process so each backend's memory is measured on its own
+    ext = os.path.splitext(file_path)[-1].lower()
+    extract = extractors.BACKENDS[ext][backend]
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        text = extract(file_path)
+    elapsed = time.perf_counter() - start
+
+    # Separate traced run: tracemalloc slows pure-Python backends and would skew the timing
+    tracemalloc.start()
+    extract(file_path)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "elapsed": elapsed,
+        "chars": len(text),
+        "python_peak": python_peak,
+        "rss_growth": process.memory_info().rss - rss_before,
+    }
+
+
+def main(paths):
+    if not paths:
+        print("Usage: python bench_extractors.py resume.pdf resume.docx ...")
+        return
+
+    print(f"📊 Text extraction backends ({RUNS} runs per file)")
+    print(f"  {'file':<28} {'backend':<12} {'pages/s':>9} {'chars':>8} {'py peak':>9} {'rss +':>9}")
+    for path in paths:
+        ext = os.path.splitext(path)[-1].lower()
+        pages = count_pages(path)
+        auto = extractors.backend_order(path)[0]
+        for backend in extractors.available_backends(ext):
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_backend, path, backend).result()
+            marker = " *" if backend == auto else ""
+            print(
+                f"  {os.path.basename(path)[:28]:<28} {backend + marker:<12} "
+                f"{pages * RUNS / result['elapsed']:>9.1f} {result['chars']:>8} "
+                f"{result['python_peak'] / 1024 / 1024:>7.1f}MB {result['rss_growth'] / 1024 / 1024:>7.1f}MB"
+            )
+    print("  * = backend picked automatically; py peak = Python heap, rss + = process growth (includes C libraries)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+# Point log_config at a scratch directory and let every record through before importing it
+LOG_DIR = tempfile.mkdtemp(prefix="careermate-logbench-")
+os.environ["LOG_DIR"] = LOG_DIR
+os.environ["LOG_LEVEL"] = "DEBUG"
+os.environ["DISCORD_LOG_LEVEL"] = "DEBUG"
+
+import log_config
+
+EVENTS = int(os.getenv("BENCH_EVENTS", "50000"))
+
+
+def per_event(logger, n=EVENTS):
+    start = time.perf_counter()
+    for i in range(n):
+        logger.debug("event %d from the gateway with payload %s", i, {"op": 0, "t": "MESSAGE_CREATE"})
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def wait_for_drain():
+    while not log_config._listener.queue.empty():
+        time.sleep(0.005)
+    time.sleep(0.05)  # last record may still be in a handler
+
+
+def bench_sync_file():
+    # The old setup: DEBUG FileHandler written on the calling (event loop) thread
+    logger = logging.getLogger("bench.sync")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = logging.FileHandler(os.path.join(LOG_DIR, "sync.log"), encoding='utf-8', mode='w')
+    handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)-8s] %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    try:
+        return per_event(logger)
+    finally:
+        handler.close()
+
+
+def main():
+    results = [("sync FileHandler (old)", bench_sync_file())]
+
+    log_config.setup_logging("bench")
+    for name, logger in [
+        ("queued JSON, app logger", logging.getLogger("careermate.bench")),
+        (f"queued JSON, gateway (sample {log_config.DISCORD_DEBUG_SAMPLE})", logging.getLogger("discord.gateway")),
+    ]:
+        micros = per_event(logger)
+        # Let the background thread catch up so runs don't compete for the GIL
+        start = time.perf_counter()
+        wait_for_drain()
+        results.append((name, micros, time.perf_counter() - start))
+    log_config.stop_logging()
+
+    print(f"📊 Logging overhead on the calling thread ({EVENTS} events each)")
+    for name, micros, *drain in results:
+        line = f"  {name:<40} {micros:8.2f} µs/event"
+        if drain:
+            line += f"  (background drain {drain[0] * 1000:.0f} ms)"
+        print(line)
+
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import discord
+
+
+class ChannelCache:
+    """Per-guild cache of text channel IDs looked up by name.
+
+    Scanning guild.text_channels on every join or message is replaced by a
+    dict lookup; call invalidate() whenever a guild's channels change.
+    """
+
+    def __init__(self):
+        self._ids = {}  # (guild_id, name) -> channel_id, or None if the channel doesn't exist
+
+    def get(self, guild, name):
+        key = (guild.id, name)
+        if key not in self._ids:
+            channel = discord.utils.get(guild.text_channels, name=name)
+            self._ids[key] = channel.id if channel else None
+        channel_id = self._ids[key]
+        return guild.get_channel(channel_id) if channel_id else None
+
+    def invalidate(self, guild_id):
+        for key in [key for key in self._ids if key[0] == guild_id]:
+            del self._ids[key]
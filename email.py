@@ -33,8 +33,12 @@ def load_contacts():
         return list(csv.DictReader(f))
 
 def save_contacts(contacts):
+    # Keep any extra columns (e.g. batch) after the standard ones
+    fieldnames = ["name", "email", "type", "status", "last_sent"]
+    for contact in contacts:
+        fieldnames += [key for key in contact if key not in fieldnames]
     with open("contacts.csv", "w", newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=["name", "email", "type", "status", "last_sent"])
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(contacts)
 
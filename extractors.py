@@ -0,0 +1,158 @@
+import logging
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from PIL import Image
+import pytesseract
+from pdf2image import convert_from_path
+from dotenv import load_dotenv
+
+# PDF/DOCX libraries are optional: any backend whose library is missing is skipped
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+try:
+    import docx
+except ImportError:
+    docx = None
+
+# Optional: Set tesseract path if on Windows
+# pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+# Load ENV
+load_dotenv()
+PDF_BACKEND = os.getenv("PDF_BACKEND", "")    # force "pymupdf" or "pdfplumber"
+DOCX_BACKEND = os.getenv("DOCX_BACKEND", "")  # force "docx-xml" or "python-docx"
+
+log = logging.getLogger("careermate.extractors")
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.webp']
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UnsupportedFormat(ValueError):
+    pass
+
+
+# PDF backends
+def pdf_pymupdf(file_path, max_pages=None):
+    with pymupdf.open(file_path) as doc:
+        count = min(doc.page_count, max_pages or doc.page_count)
+        return "\n".join(doc[i].get_text() for i in range(count))
+
+def pdf_pdfplumber(file_path, max_pages=None):
+    with pdfplumber.open(file_path) as pdf:
+        return "\n".join(page.extract_text() or '' for page in pdf.pages[:max_pages])
+
+
+# DOCX backends
+def _paragraph_text(paragraph):
+    parts = []
+    for elem in paragraph.iter():
+        if elem.tag == W + "t":
+            parts.append(elem.text or '')
+        elif elem.tag == W + "tab":
+            parts.append("\t")
+        elif elem.tag in (W + "br", W + "cr"):
+            parts.append("\n")
+    return "".join(parts)
+
+def docx_xml(file_path, max_pages=None):
+    """Stream word/document.xml, keeping table rows as "cell | cell | cell" lines."""
+    lines = []
+    rows, cells = [], []  # stacks, so nested tables keep their place
+    with zipfile.ZipFile(file_path) as z, z.open("word/document.xml") as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elem.tag == W + "tr":
+                    rows.append([])
+                elif elem.tag == W + "tc":
+                    cells.append([])
+                continue
+
+            if elem.tag == W + "p":
+                text = _paragraph_text(elem)
+                (cells[-1] if cells else lines).append(text)
+                elem.clear()
+            elif elem.tag == W + "tc":
+                rows[-1].append(" ".join(t for t in cells.pop() if t.strip()))
+            elif elem.tag == W + "tr":
+                row = rows.pop()
+                if any(row):
+                    (cells[-1] if cells else lines).append(" | ".join(row))
+                elem.clear()
+    return "\n".join(lines)
+
+def docx_python_docx(file_path, max_pages=None):
+    doc = docx.Document(file_path)
+    return '\n'.join(p.text for p in doc.paragraphs)
+
+
+# In order of preference for each extension
+BACKENDS = {
+    '.pdf': {'pymupdf': pdf_pymupdf, 'pdfplumber': pdf_pdfplumber},
+    '.docx': {'docx-xml': docx_xml, 'python-docx': docx_python_docx},
+}
+_LIBRARIES = {'pymupdf': pymupdf, 'pdfplumber': pdfplumber, 'python-docx': docx}
+_FORCED = {'.pdf': PDF_BACKEND, '.docx': DOCX_BACKEND}
+
+
+def available_backends(ext):
+    return [name for name in BACKENDS.get(ext, {}) if _LIBRARIES.get(name, True) is not None]
+
+def backend_order(file_path):
+    """Backends to try for this file: the forced one (if any) first, then by preference."""
+    ext = os.path.splitext(file_path)[-1].lower()
+    available = available_backends(ext)
+    if not available:
+        raise UnsupportedFormat(f"No text extraction backend for {ext} files")
+    forced = _FORCED.get(ext)
+    if forced in available:
+        available.remove(forced)
+        available.insert(0, forced)
+    return available
+
+
+def extract_text(file_path, backend=None, max_pages=None):
+    """Extract text from a resume file with the fastest backend that can read it.
+
+    Scanned PDFs with no text layer fall back to OCR. Raises UnsupportedFormat
+    for file types no installed backend can read, or if the requested backend
+    isn't installed.
+    """
+    ext = os.path.splitext(file_path)[-1].lower()
+
+    if ext == '.txt':
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    if ext in IMAGE_EXTENSIONS:
+        return pytesseract.image_to_string(Image.open(file_path))
+
+    if ext not in BACKENDS:
+        raise UnsupportedFormat(f"Unsupported file format: {ext}")
+    if backend and backend not in available_backends(ext):
+        raise UnsupportedFormat(f"Backend {backend} is not available for {ext} files")
+
+    # A file the preferred backend can't read (e.g. a damaged PDF) gets another try with the next one
+    for name in [backend] if backend else backend_order(file_path):
+        try:
+            text = BACKENDS[ext][name](file_path, max_pages=max_pages)
+            break
+        except Exception as e:
+            log.warning(f"Backend {name} could not read {file_path}: {e!r}")
+            error = e
+    else:
+        raise error
+
+    # Fallback to OCR if needed
+    if ext == '.pdf' and not text.strip():
+        for img in convert_from_path(file_path, last_page=max_pages):
+            text += pytesseract.image_to_string(img)
+    return text
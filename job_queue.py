@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import time
+from dotenv import load_dotenv
+
+# Load ENV
+load_dotenv()
+JOB_DB = os.getenv("JOB_DB", "jobs.db")
+VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "600"))  # seconds a claimed job stays hidden
+MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+RETRY_DELAY = int(os.getenv("JOB_RETRY_DELAY", "30"))  # multiplied by the attempt number
+
+# Job lifecycle: queued -> running -> done / failed -> delivered
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    locked_until REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at);
+"""
+
+
+class JobQueue:
+    """Durable job queue stored in SQLite, shared by the bot and the worker processes.
+
+    Every process opens its own connection. Claimed jobs are hidden for
+    VISIBILITY_TIMEOUT seconds, so a job held by a crashed worker is picked
+    up again by another one.
+    """
+
+    def __init__(self, path=JOB_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, kind, payload, max_attempts=MAX_ATTEMPTS):
+        now = time.time()
+        cur = self.conn.execute(
+            "INSERT INTO jobs (kind, payload, max_attempts, available_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload), max_attempts, now, now, now),
+        )
+        return cur.lastrowid
+
+    def claim(self, visibility_timeout=VISIBILITY_TIMEOUT):
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs whose worker died on the last allowed attempt are given up on
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Worker timed out', updated_at = ? "
+                "WHERE status = 'running' AND locked_until < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = self.conn.execute(
+                "SELECT * FROM jobs "
+                "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND locked_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_until = ?, updated_at = ? "
+                "WHERE id = ?",
+                (now + visibility_timeout, now, row['id']),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        job = self._to_dict(row)
+        job['attempts'] += 1
+        return job
+
+    def complete(self, job, result):
+        """Store the result. Returns 0 if the lease expired and another attempt owns the job."""
+        # The attempts check stops a worker whose lease expired from overwriting a newer attempt
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, locked_until = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'running' AND attempts = ?",
+            (result, time.time(), job['id'], job['attempts']),
+        )
+        return cur.rowcount
+
+    def fail(self, job, error, result=None):
+        """Record a failed attempt.
+
+        Returns 'queued' if the job will be retried, 'failed' if it gave up, or
+        None if the lease expired and another attempt owns the job.
+        """
+        now = time.time()
+        if job['attempts'] < job['max_attempts']:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, locked_until = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'running' AND attempts = ?",
+                (error, now + RETRY_DELAY * job['attempts'], now, job['id'], job['attempts']),
+            )
+            return 'queued' if cur.rowcount else None
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, result = ?, locked_until = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'running' AND attempts = ?",
+            (error, result, now, job['id'], job['attempts']),
+        )
+        return 'failed' if cur.rowcount else None
+
+    def finished(self, limit=20):
+        # Jobs without a channel_id are awaited directly by the bot (see get()), not posted
+        rows = self.conn.execute(
+            "SELECT * FROM jobs WHERE status IN ('done', 'failed') "
+            "AND json_extract(payload, '$.channel_id') IS NOT NULL ORDER BY id LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def get(self, job_id):
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def mark_delivered(self, job_id):
+        self.conn.execute(
+            "UPDATE jobs SET status = 'delivered', updated_at = ? WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def counts(self):
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        return job
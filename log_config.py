@@ -0,0 +1,144 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import uuid
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+# Load ENV
+load_dotenv()
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")  # e.g. "midnight" to rotate by time instead of size
+DISCORD_LOG_LEVEL = os.getenv("DISCORD_LOG_LEVEL", "INFO")
+DISCORD_DEBUG_SAMPLE = float(os.getenv("DISCORD_DEBUG_SAMPLE", "0.01"))  # share of gateway DEBUG records kept
+
+# One ID per process run (set in setup_logging, after worker processes fork), one per command/job
+session_id = None
+request_id = contextvars.ContextVar("request_id", default=None)
+
+_listener = None
+
+
+class ContextFilter(logging.Filter):
+    """Stamps every record with the session and current request ID."""
+
+    def filter(self, record):
+        record.session_id = session_id
+        record.request_id = request_id.get()
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Keeps only a random share of DEBUG records from one logger tree; everything else passes."""
+
+    def __init__(self, rate, prefix="discord"):
+        super().__init__()
+        self.rate = rate
+        self.prefix = prefix
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or not record.name.startswith(self.prefix):
+            return True
+        return random.random() < self.rate
+
+
+class LightQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that only merges the message on the caller's thread.
+
+    The stock prepare() runs a full format and copies the record; the JSON
+    formatting is left to the listener thread instead.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "session_id": getattr(record, "session_id", None),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _file_handler(filename):
+    path = os.path.join(LOG_DIR, filename)
+    if LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def setup_logging(name="bot"):
+    """Route all logging through a queue so file writes happen on a background thread.
+
+    Application logs go to logs/<name>.log and discord.py's gateway logs to
+    logs/<name>-discord.log, each rotated and written as one JSON object per line.
+    """
+    global _listener, session_id
+    if _listener is not None:
+        return
+    session_id = uuid.uuid4().hex[:12]
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    app_handler = _file_handler(f"{name}.log")
+    app_handler.addFilter(lambda record: not record.name.startswith("discord"))
+
+    discord_handler = _file_handler(f"{name}-discord.log")
+    discord_handler.addFilter(lambda record: record.name.startswith("discord"))
+
+    console = logging.StreamHandler()
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)-8s] %(name)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LightQueueHandler(log_queue)
+    # Gateway DEBUG output is very chatty, so it is sampled before it reaches the queue
+    queue_handler.addFilter(SampleFilter(DISCORD_DEBUG_SAMPLE))
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+    logging.getLogger("discord").setLevel(DISCORD_LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, app_handler, discord_handler, console, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush everything still queued and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
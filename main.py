@@ -1,29 +1,29 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import csv
 import os
 from dotenv import load_dotenv
 from datetime import datetime
-from PIL import Image
-import pytesseract
-import pdfplumber
-from pdf2image import convert_from_path
-import docx
-from deep_translator import GoogleTranslator
-import ollama
 import asyncio
+import sqlite3
+import time
+from job_queue import JobQueue
+from log_config import setup_logging, request_id
+from channels import ChannelCache
+from welcome import WelcomeBatcher
+from score_history import ScoreHistory, SECTIONS as SCORE_SECTIONS
 
 
-# Optional: Set tesseract path if on Windows
-# pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-
 # Load ENV
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
+JOB_WAIT_TIMEOUT = int(os.getenv("JOB_WAIT_TIMEOUT", "600"))  # seconds a conversation waits for a worker
+DELIVERY_ATTEMPTS = int(os.getenv("JOB_DELIVERY_ATTEMPTS", "5"))
 
-# Logging
-handler = logging.FileHandler(filename='discord.log', encoding='utf-8', mode='w')
+# Logging (queued, rotating JSON files under logs/)
+setup_logging("bot")
+log = logging.getLogger("careermate")
 
 # Intents
 intents = discord.Intents.default()
@@ -43,14 +43,27 @@ invite_cache = {}
 # Resume file tracking (add this 👇)
 user_resume_files = {}
 
+# Heavy resume/file work is queued for worker.py and posted back by deliver_results
+job_queue = JobQueue()
+
+# Channel IDs by name, refreshed on channel create/update/delete
+channel_cache = ChannelCache()
+
+# Resume scores written by the workers, with rollups for !stats
+score_history = ScoreHistory()
+
 # CSV functions
 def load_contacts():
     with open("contacts.csv", newline='', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 def save_contacts(contacts):
+    # Keep any extra columns (e.g. batch) after the standard ones
+    fieldnames = ["name", "email", "type", "status", "last_sent"]
+    for contact in contacts:
+        fieldnames += [key for key in contact if key not in fieldnames]
     with open("contacts.csv", "w", newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=["name", "email", "type", "status", "last_sent"])
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(contacts)
 
@@ -60,82 +73,130 @@ def match_contact(name, contacts):
             return contact
     return None
 
-# Translate
-def translate(text, target_lang='en', source_lang='auto'):
-    return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+def find_contact(name, contacts):
+    for contact in contacts:
+        if contact['name'].lower() in name.lower():
+            return contact
+    return None
 
-# Ask LLM
-def ask_llm(prompt, image_paths=None):
-    try:
-        messages = [{"role": "user", "content": prompt}]
-        if image_paths:
-            messages[0]["images"] = image_paths
-        response = ollama.chat(model='llava:7b', messages=messages)
-        return response['message']['content'] if 'message' in response else "⚠️ LLM response error."
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
+# Events
+@bot.event
+async def on_ready():
+    log.info(f"✅ Bot is ready as {bot.user.name}")
+    for guild in bot.guilds:
+        invites = await guild.invites()
+        invite_cache[guild.id] = {invite.code: invite.uses for invite in invites}
+    if not deliver_results.is_running():
+        deliver_results.start()
+
+# Run a job on the workers and wait for its result (for flows that continue the conversation)
+async def run_job(kind, payload, timeout=JOB_WAIT_TIMEOUT):
+    job_id = job_queue.enqueue(kind, dict(payload, request_id=request_id.get()))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(1)
+        job = job_queue.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            job_queue.mark_delivered(job_id)
+            if job['status'] == 'failed':
+                raise RuntimeError(job['error'])
+            return job['result']
+    raise RuntimeError("No worker finished the job in time")
+
+async def send_response(channel, content, file_name):
+    if len(content) <= 2000:
+        await channel.send(content)
+    else:
+        with open(file_name, "w", encoding='utf-8') as f:
+            f.write(content)
+        await channel.send("📎 Response too long, see file:", file=discord.File(file_name))
+        os.remove(file_name)
 
-# Extract text from any file
-def extract_text_from_file(file_path):
-    ext = os.path.splitext(file_path)[-1].lower()
+# Failed sends per job ID, so a result is only dropped after DELIVERY_ATTEMPTS tries
+delivery_failures = {}
+
+# Post results of finished jobs back to the channel they came from
+@tasks.loop(seconds=2)
+async def deliver_results():
     try:
-        if ext == '.txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-
-        elif ext == '.pdf':
-            text = ''
-            # Try digital text extraction first
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ''
-            # Fallback to OCR if needed
-            if not text.strip():
-                images = convert_from_path(file_path)
-                for img in images:
-                    text += pytesseract.image_to_string(img)
-            return text
-
-        elif ext == '.docx':
-            doc = docx.Document(file_path)
-            return '\n'.join(p.text for p in doc.paragraphs)
-
-        elif ext in ['.jpg', '.jpeg', '.png', '.bmp', '.webp']:
-            return pytesseract.image_to_string(Image.open(file_path))
+        jobs = job_queue.finished()
+    except sqlite3.Error as e:
+        log.error(f"Could not read finished jobs: {e}")
+        return
+
+    for job in jobs:
+        payload = job['payload']
+        request_id.set(payload.get('request_id'))
+        content = job['result'] or f"⚠️ Could not finish your request: {job['error']}"
 
+        try:
+            # DM channels aren't cached after a restart, so fall back to fetching them
+            channel = bot.get_channel(payload['channel_id']) or await bot.fetch_channel(payload['channel_id'])
+            await send_response(channel, content, f"job_{job['id']}_response.txt")
+        except (discord.NotFound, discord.Forbidden) as e:
+            log.error(f"Channel {payload['channel_id']} not available for job #{job['id']}: {e}")
+        except Exception as e:
+            failures = delivery_failures.get(job['id'], 0) + 1
+            delivery_failures[job['id']] = failures
+            if failures < DELIVERY_ATTEMPTS:
+                log.warning(f"Failed to deliver job #{job['id']} (attempt {failures}), will retry: {e}")
+                continue
+            log.error(f"Giving up on delivering job #{job['id']} after {failures} attempts: {e}")
         else:
-            return "❌ Unsupported file format."
+            if job['status'] == 'done' and payload.get('reaction'):
+                try:
+                    message = await channel.fetch_message(payload['message_id'])
+                    await message.add_reaction(payload['reaction'])
+                except Exception as e:
+                    log.warning(f"Could not react to message for job #{job['id']}: {e}")
 
-    except Exception as e:
-        return f"❌ Error extracting text: {str(e)}"
+        delivery_failures.pop(job['id'], None)
+        try:
+            job_queue.mark_delivered(job['id'])
+        except sqlite3.Error as e:
+            log.error(f"Could not mark job #{job['id']} delivered, it may be posted again: {e}")
 
-# Events
 @bot.event
-async def on_ready():
-    print(f"✅ Bot is ready as {bot.user.name}")
-    for guild in bot.guilds:
-        invites = await guild.invites()
-        invite_cache[guild.id] = {invite.code: invite.uses for invite in invites}
+async def on_guild_channel_create(channel):
+    channel_cache.invalidate(channel.guild.id)
 
 @bot.event
-async def on_member_join(member):
-    print(f"[JOIN] {member.name} has joined.")
+async def on_guild_channel_update(before, after):
+    channel_cache.invalidate(after.guild.id)
 
-    general_channel = discord.utils.get(member.guild.text_channels, name='general')
-    college_channel = discord.utils.get(member.guild.text_channels, name='college-community')
-    alumni_channel = discord.utils.get(member.guild.text_channels, name='alumni-requests')
+@bot.event
+async def on_guild_channel_delete(channel):
+    channel_cache.invalidate(channel.guild.id)
+
+# One welcome per batch of joins instead of two messages per member
+async def send_welcome(guild, members):
+    mentions = ", ".join(m.mention for m in members)
+    general_channel = channel_cache.get(guild, 'general')
+    college_channel = channel_cache.get(guild, 'college-community')
 
     if general_channel:
         await general_channel.send(
-            f"🎉 Welcome {member.mention} to **CareerMate Discord of Kongunadu College of Engineering and Technology**!\n\n"
+            f"🎉 Welcome {mentions} to **CareerMate Discord of Kongunadu College of Engineering and Technology**!\n\n"
             f"👉 Type `!help` to see all available commands and get started.\n"
     )
 
 
     if college_channel:
-        await college_channel.send(f"🎉 Welcome {member.mention} to **CareerMate Discord of Kongunadu College of Engineering and Technology**!"
+        await college_channel.send(f"🎉 Welcome {mentions} to **CareerMate Discord of Kongunadu College of Engineering and Technology**!"
                                    f"👉 Type `!help` to see all available commands and get started.\n")
 
+welcome_batcher = WelcomeBatcher(send_welcome)
+
+@bot.event
+async def on_member_join(member):
+    request_id.set(f"join-{member.id}")
+    log.info(f"[JOIN] {member.name} has joined.")
+
+    college_channel = channel_cache.get(member.guild, 'college-community')
+    alumni_channel = channel_cache.get(member.guild, 'alumni-requests')
+
+    welcome_batcher.add(member)
+
     # Invite tracking
     guild = member.guild
     try:
@@ -148,7 +209,7 @@ async def on_member_join(member):
                 break
         invite_cache[guild.id] = {invite.code: invite.uses for invite in new_invites}
     except Exception as e:
-        print(f"[ERROR] Failed to check invites: {e}")
+        log.error(f"Failed to check invites: {e}")
 
     # CSV Update and Role Detection
     contacts = load_contacts()
@@ -157,15 +218,15 @@ async def on_member_join(member):
     if matched:
         matched['status'] = 'joined'
         save_contacts(contacts)
-        print(f"✅ CSV updated for {matched['name']}")
+        log.info(f"✅ CSV updated for {matched['name']}")
         user_type = matched.get('type', '').lower()
     else:
-        print(f"ℹ️ No match found for {member.name}")
+        log.info(f"ℹ️ No match found for {member.name}")
         return  # Don't proceed if no match found
 
     # If the user is staff, do nothing further
     if user_type == 'staff':
-        print(f"👩‍🏫 {member.name} is staff, skipping career questions.")
+        log.info(f"👩‍🏫 {member.name} is staff, skipping career questions.")
         return
 
     # Proceed only for students or alumni
@@ -173,7 +234,7 @@ async def on_member_join(member):
     if user_type in ['student', 'alumni']:
         await asyncio.sleep(10)
         if not college_channel:
-            print("❌ college-community channel not found.")
+            log.warning("❌ college-community channel not found.")
             return
 
         try:
@@ -200,24 +261,20 @@ async def on_member_join(member):
 
                     if msg.attachments:
                         attachment = msg.attachments[0]
-                        file_path = f"./temp/{attachment.filename}"
+                        file_path = f"./temp/{msg.id}_{attachment.filename}"
                         os.makedirs("temp", exist_ok=True)
                         await attachment.save(file_path)
 
-                        text = extract_text_from_file(file_path)
-                        if not text.strip():
+                        # Extraction and the LLM run on the workers
+                        try:
+                            role = await run_job('top_role', {'file_path': file_path, 'remove_file': True})
+                        except Exception as e:
+                            await college_channel.send(f"⚠️ Error while processing the resume: `{e}`")
+                            return
+                        if not role:
                             await college_channel.send("⚠️ Could not extract text from the resume.")
                             return
 
-                        # Use LLM to extract role
-                        prompt = (
-                            "From the resume text below, list only the **single most suitable job role** for this user. "
-                            "Return just the role name, no extra explanation.\n\n"
-                            f"Resume:\n{text[:3000]}"
-                        )
-                        role_response = ask_llm(prompt)
-                        role = role_response.strip().split("\n")[0]
-
                     else:
                         role = msg.content.strip().title()
 
@@ -265,7 +322,7 @@ async def on_member_join(member):
                 )
 
         except Exception as e:
-            print(f"[ERROR] While processing career questions: {e}")
+            log.exception(f"While processing career questions: {e}")
 
 
 
@@ -281,10 +338,11 @@ async def on_message(message):
         content = message.content.lower()
 
         if "apply" in content and ("internship" in content or "job" in content):
+            request_id.set(f"msg-{message.id}")
             college_channel = message.channel
             member = message.author
             choice = "internship" if "internship" in content else "job"
-            alumni_channel = discord.utils.get(message.guild.text_channels, name='alumni-requests')
+            alumni_channel = channel_cache.get(message.guild, 'alumni-requests')
 
             await college_channel.send(
                 f"👋 {member.mention}, please upload your **resume** (PDF, DOCX, or image), "
@@ -299,24 +357,20 @@ async def on_message(message):
 
                 if msg.attachments:
                     attachment = msg.attachments[0]
-                    file_path = f"./temp/{attachment.filename}"
+                    file_path = f"./temp/{msg.id}_{attachment.filename}"
                     os.makedirs("temp", exist_ok=True)
                     await attachment.save(file_path)
 
-                    text = extract_text_from_file(file_path)
-                    if not text.strip():
+                    # Extraction and the LLM run on the workers
+                    try:
+                        role = await run_job('top_role', {'file_path': file_path, 'remove_file': True})
+                    except Exception as e:
+                        await college_channel.send(f"⚠️ Error while processing the resume: `{e}`")
+                        return
+                    if not role:
                         await college_channel.send("⚠️ Could not extract text from the resume.")
                         return
 
-                    # Extract role using LLM
-                    prompt = (
-                        "From the resume text below, list only the **single most suitable job role** for this user. "
-                        "Return just the role name, no extra explanation.\n\n"
-                        f"Resume:\n{text[:3000]}"
-                    )
-                    role_response = ask_llm(prompt)
-                    role = role_response.strip().split("\n")[0]
-
                 else:
                     role = msg.content.strip().title()
 
@@ -385,6 +439,35 @@ async def status(ctx):
     pending = total - joined
     await ctx.send(f"📊 Status:\n👥 Total: {total}\n✅ Joined: {joined}\n⏳ Pending: {pending}")
 
+@bot.command()
+async def stats(ctx):
+    overall = score_history.averages("all").get("all")
+    if not overall:
+        await ctx.send("📊 No resume scores recorded yet. Try `!resume` first!")
+        return
+
+    sections = ", ".join(f"{s}: {overall[s]}" for s in SCORE_SECTIONS if s in overall)
+    by_type = "\n".join(
+        f"• {user_type.title()}: {values['Overall']} ({values['count']} reviews)"
+        for user_type, values in score_history.averages("type").items() if 'Overall' in values
+    )
+    distribution = " | ".join(
+        f"{i * 10}-{i * 10 + 9 if i < 9 else 100}: {count}"
+        for i, count in enumerate(score_history.distribution("Overall")) if count
+    )
+    improvement = score_history.improvement()
+    roles = ", ".join(f"{role} ({count})" for role, count in score_history.top_roles())
+
+    await ctx.send(
+        f"📊 **Resume Stats** ({overall.get('count', 0)} reviews)\n"
+        f"⭐ Average Overall: {overall.get('Overall', '-')}\n"
+        f"📋 Sections: {sections}\n\n"
+        f"👥 **By type:**\n{by_type or '—'}\n\n"
+        f"📈 Overall distribution: {distribution or '—'}\n"
+        f"🔁 {improvement['users']} users reviewed again, average change {improvement['average_change']:+}\n"
+        f"🎯 Top suggested roles: {roles or '—'}"
+    )
+
 @bot.command()
 async def help(ctx):
     help_message = (
@@ -396,6 +479,7 @@ async def help(ctx):
         f"• `want to apply for internship/job` – internship/job 👋\n"
         f"• `!resume` – Upload your resume for AI review and suggestions 💼\n"
         f"• `!bot role` – Get a job/internship role recommendation from your resume 🔍\n"
+        f"• `!stats` – See average resume scores and top roles 📊\n"
         f"• `!help` – Show this help menu ℹ️\n\n"
     )
     await ctx.send(help_message)
@@ -404,17 +488,15 @@ async def help(ctx):
 
 @bot.command(name='bot')
 async def bot_command(ctx, *, message: str = ""):
-    # General chatbot conversation only
-    prompt = translate(message, 'en')
-    response = ask_llm(prompt)
+    # General chatbot conversation only (translation and LLM run on the workers)
+    try:
+        async with ctx.typing():
+            response = await run_job('chat', {'message': message})
+    except Exception as e:
+        await ctx.send(f"⚠️ Error: {e}")
+        return
 
-    if len(response) <= 2000:
-        await ctx.send(f"🧠 CareerMate:\n{response}")
-    else:
-        with open("response.txt", "w", encoding='utf-8') as f:
-            f.write(response)
-        await ctx.send("📎 Response too long, see file:", file=discord.File("response.txt"))
-        os.remove("response.txt")
+    await send_response(ctx.channel, f"🧠 CareerMate:\n{response}", f"response_{ctx.message.id}.txt")
 
 
 import os
@@ -432,7 +514,7 @@ async def askfile(ctx):
         return
 
     attachment = ctx.message.attachments[0]
-    file_path = f"./temp/{attachment.filename}"
+    file_path = f"./temp/{ctx.message.id}_{attachment.filename}"
     os.makedirs("temp", exist_ok=True)
     await attachment.save(file_path)
 
@@ -441,24 +523,14 @@ async def askfile(ctx):
         os.remove(file_path)
         return
 
-    text = extract_text_from_file(file_path)
-    if not text.strip():
-        await ctx.send("⚠️ Could not extract text from the file.")
-        os.remove(file_path)
-        return
-
-    prompt = translate(text)
-    response = ask_llm(prompt)
-
-    if len(response) <= 2000:
-        await ctx.send(f"🧠 CareerMate:\n{response}")
-    else:
-        with open("file_response.txt", "w", encoding='utf-8') as f:
-            f.write(response)
-        await ctx.send("📎 Response too long, see file:", file=discord.File("file_response.txt"))
-        os.remove("file_response.txt")
-
-    os.remove(file_path)
+    job_queue.enqueue('askfile', {
+        'channel_id': ctx.channel.id,
+        'message_id': ctx.message.id,
+        'request_id': request_id.get(),
+        'file_path': file_path,
+        'remove_file': True,
+    })
+    await ctx.send("🕐 Got it! Your file is queued, I'll reply here when it's ready.")
 
 
 @bot.command(name="resume-role")
@@ -485,27 +557,15 @@ async def resume_role(ctx):
             await ctx.send("📎 Please upload your resume as a file attachment when using `!resume-role`.")
             return
 
-        text = extract_text_from_file(file_path)
-        if not text.strip():
-            await ctx.send("⚠️ Couldn't extract content from your resume.")
-            return
-
-        prompt = (
-            "From the resume text below, list 3 to 5 most suitable job roles for this user. "
-            "Return the roles as a comma-separated list only, without any explanation.\n\n"
-            f"Resume:\n{text[:3000]}"
-        )
-        try:
-            response = ask_llm(prompt)
-            roles = [r.strip() for r in response.split(",") if r.strip()]
-            if not roles:
-                await ctx.send("⚠️ No roles identified from the resume.")
-                return
-
-            formatted_roles = "\n".join(f"🔹 {role}" for role in roles)
-            await ctx.send(f"🎯 **Top Recommended Roles for You, {ctx.author.mention}:**\n{formatted_roles}")
-        except Exception as e:
-            await ctx.send(f"⚠️ Error while processing the resume: `{e}`")
+        job_queue.enqueue('resume_role', {
+            'channel_id': ctx.channel.id,
+            'message_id': ctx.message.id,
+            'request_id': request_id.get(),
+            'author_mention': ctx.author.mention,
+            'file_path': file_path,
+            'remove_file': False,
+        })
+        await ctx.send("🕐 Your resume is queued for role suggestions, I'll reply here when it's ready.")
 
 
 @bot.command()
@@ -516,7 +576,7 @@ async def resume(ctx):
             return
 
         attachment = ctx.message.attachments[0]
-        file_path = f"./temp/{attachment.filename}"
+        file_path = f"./temp/{ctx.message.id}_{attachment.filename}"
 
         # File extension check
         if not file_path.lower().endswith(('.pdf', '.docx', '.png', '.jpg', '.jpeg')):
@@ -526,52 +586,27 @@ async def resume(ctx):
         os.makedirs("temp", exist_ok=True)
         await attachment.save(file_path)
 
-        async with ctx.typing():
-            text = extract_text_from_file(file_path)
-            if not text.strip():
-                await ctx.send("⚠️ Could not extract text from the resume.")
-                os.remove(file_path)
-                return
-
-            prompt = f"""
-You are a professional resume reviewer.
-
-Analyze the resume below and provide:
-
-1. Score (0–100) for each section:
-   - Objective
-   - Experience
-   - Projects
-   - Skills
-   - Education
-   - Certifications
-
-2. Overall Score (0–100)
-
-3. Best Recommended Role (1 job title only)
-
-4. Key Strengths (3 bullet points)
-
-5. Key Weaknesses (3 bullet points)
-
-6. Suggestions to improve each section
-
-Resume:
-{text[:3000]}
-"""
-
-            try:
-                result = ask_llm(prompt)
-
-                await ctx.send(f"📄 **Resume Review for `{ctx.author.name}`**\n\n{result}")
-                await ctx.message.add_reaction("✅")
-
-            except Exception as e:
-                await ctx.send(f"⚠️ Error analyzing resume: {e}")
-
-            finally:
-                os.remove(file_path)
-
-
-# Run the bot
-bot.run(TOKEN, log_handler=handler, log_level=logging.DEBUG)
+        contact = find_contact(ctx.author.name, load_contacts()) or {}
+        job_queue.enqueue('resume', {
+            'channel_id': ctx.channel.id,
+            'message_id': ctx.message.id,
+            'request_id': request_id.get(),
+            'user_id': ctx.author.id,
+            'author_name': ctx.author.name,
+            'user_type': contact.get('type'),
+            'batch': contact.get('batch'),
+            'file_path': file_path,
+            'remove_file': True,
+            'reaction': "✅",
+        })
+        await ctx.send("🕐 Your resume is queued for review, I'll reply here when it's ready.")
+
+
+# Tag every log line written while a command runs with the invoking message ID
+@bot.before_invoke
+async def set_request_id(ctx):
+    request_id.set(f"cmd-{ctx.message.id}")
+
+
+# Run the bot (logging is already configured by setup_logging)
+bot.run(TOKEN, log_handler=None)
@@ -1,10 +1,13 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import pdfplumber
+import os
 import tempfile
 import traceback
 import ollama
 import json
+from contextlib import closing
+from score_history import ScoreHistory
+from extractors import extract_text, BACKENDS
 
 app = Flask(__name__)
 CORS(app)  # 🔥 FIXED: Removed extra indentation here
@@ -18,11 +21,14 @@ def analyze_resume():
         file = request.files['resume']
 
         # Extract text (only first 2 pages for faster processing)
-        if file.filename.endswith('.pdf'):
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        ext = os.path.splitext(file.filename)[-1].lower()
+        if ext in BACKENDS:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
                 file.save(tmp.name)
-                with pdfplumber.open(tmp.name) as pdf:
-                    text = "\n".join([page.extract_text() or '' for page in pdf.pages[:2]])
+            try:
+                text = extract_text(tmp.name, max_pages=2)
+            finally:
+                os.remove(tmp.name)
         else:
             text = file.read().decode('utf-8', errors='ignore')
 
@@ -63,11 +69,31 @@ Return only JSON in this format:
 
         result = json.loads(json_str)
 
+        # Keep the scores for /stats (optional user_id/type/batch form fields tag the entry).
+        # Best-effort: a locked or broken scores DB must not fail the analysis.
+        try:
+            with closing(ScoreHistory()) as history:
+                history.record(
+                    result,
+                    user_id=request.form.get('user_id'),
+                    user_type=request.form.get('type'),
+                    batch=request.form.get('batch'),
+                    source="web",
+                )
+        except Exception:
+            app.logger.exception("Failed to store resume scores")
+
         return jsonify(result)
 
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": "Failed to analyze resume", "details": str(e)}), 500
 
+@app.route('/stats', methods=['GET'])
+def stats():
+    # Served from the precomputed rollups, not by scanning every stored score
+    with closing(ScoreHistory()) as history:
+        return jsonify(history.summary())
+
 if __name__ == "__main__":
     app.run(port=5001, debug=True)
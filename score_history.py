@@ -0,0 +1,267 @@
+import os
+import re
+import sqlite3
+import time
+from dotenv import load_dotenv
+
+# Load ENV
+load_dotenv()
+SCORES_DB = os.getenv("SCORES_DB", "scores.db")
+
+SECTIONS = ["Objective", "Experience", "Projects", "Skills", "Education", "Certifications", "Overall"]
+
+# scores keeps every review; the other tables are rollups updated on each insert,
+# so stats are read from a handful of rows instead of rescanning the history
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER UNIQUE,
+    user_id TEXT,
+    user_name TEXT,
+    user_type TEXT,
+    batch TEXT,
+    role TEXT,
+    source TEXT NOT NULL,
+    objective INTEGER,
+    experience INTEGER,
+    projects INTEGER,
+    skills INTEGER,
+    education INTEGER,
+    certifications INTEGER,
+    overall INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup (
+    dim TEXT NOT NULL,
+    key TEXT NOT NULL,
+    section TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    total REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (dim, key, section)
+);
+CREATE TABLE IF NOT EXISTS distribution (
+    section TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (section, bucket)
+);
+CREATE TABLE IF NOT EXISTS user_progress (
+    user_id TEXT PRIMARY KEY,
+    reviews INTEGER NOT NULL,
+    first_overall INTEGER NOT NULL,
+    last_overall INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS role_suggestions (
+    job_id INTEGER PRIMARY KEY,
+    roles TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# Only whole lines in the "Section: NN/100" format the !resume prompt asks for
+# (list numbers and markdown bullets/bold around them are tolerated)
+_SCORE_PATTERN = re.compile(
+    rf"^[\s*-]*(?:\d+\.[\s*]*)?({'|'.join(SECTIONS)})[\s*]*:[\s*]*(\d{{1,3}})\s*/\s*100[\s*.]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_ROLE_PATTERN = re.compile(r"^[\s*-]*(?:\d+\.[\s*]*)?Best Recommended Role[\s*]*:[\s*]*(.+?)[\s*.]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def parse_scores(text):
+    """Pull section scores out of the strict score lines of a !resume review."""
+    scores = {}
+    for section, value in _SCORE_PATTERN.findall(text):
+        section = section.title()
+        if section not in scores and 0 <= int(value) <= 100:
+            scores[section] = int(value)
+    return scores
+
+
+def parse_role(text):
+    match = _ROLE_PATTERN.search(text)
+    return match.group(1).strip(" .") if match else None
+
+
+def _to_score(value):
+    # LLM JSON may hold "75", 75.0 or "N/A"
+    try:
+        value = int(float(value))
+    except (TypeError, ValueError):
+        return None
+    return value if 0 <= value <= 100 else None
+
+
+class ScoreHistory:
+    _initialized = set()  # database paths whose schema this process already created
+
+    def __init__(self, path=SCORES_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        if path not in ScoreHistory._initialized:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            ScoreHistory._initialized.add(path)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, scores, user_id=None, user_name=None, user_type=None, batch=None, role=None,
+               source="bot", job_id=None):
+        """Store one review and update every rollup in the same transaction.
+
+        A job_id that was already recorded (a retried or re-claimed job) is ignored.
+        """
+        scores = {s: _to_score(scores.get(s)) for s in SECTIONS}
+        scores = {s: value for s, value in scores.items() if value is not None}
+        if not scores:
+            return None
+
+        now = time.time()
+        user_type = (user_type or "unknown").lower()
+        batch = batch or "unknown"
+        dims = [("all", "all"), ("type", user_type), ("batch", batch)]
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if role:
+                dims.append(("role", self._rollup_key("role", role.strip())))
+            cur = self.conn.execute(
+                "INSERT INTO scores (job_id, user_id, user_name, user_type, batch, role, source, "
+                "objective, experience, projects, skills, education, certifications, overall, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (job_id) DO NOTHING",
+                (job_id, user_id, user_name, user_type, batch, role, source,
+                 *[scores.get(s) for s in SECTIONS], now),
+            )
+            if cur.rowcount == 0:
+                self.conn.execute("COMMIT")
+                return None
+            for section, value in scores.items():
+                for dim, key in dims:
+                    self.conn.execute(
+                        "INSERT INTO rollup (dim, key, section, count, total) VALUES (?, ?, ?, 1, ?) "
+                        "ON CONFLICT (dim, key, section) DO UPDATE SET count = count + 1, total = total + excluded.total",
+                        (dim, key, section, value),
+                    )
+                self.conn.execute(
+                    "INSERT INTO distribution (section, bucket, count) VALUES (?, ?, 1) "
+                    "ON CONFLICT (section, bucket) DO UPDATE SET count = count + 1",
+                    (section, min(value // 10, 9)),
+                )
+            if user_id and "Overall" in scores:
+                self._update_progress(str(user_id), scores["Overall"])
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return cur.lastrowid
+
+    def _update_progress(self, user_id, overall):
+        row = self.conn.execute(
+            "SELECT reviews, first_overall, last_overall FROM user_progress WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO user_progress (user_id, reviews, first_overall, last_overall) VALUES (?, 1, ?, ?)",
+                (user_id, overall, overall),
+            )
+            return
+
+        reviews, first, last = row
+        # Keep the sum of (latest - first) over users with 2+ reviews in step with this change
+        self._bump("improvement_total", (overall - first) - (last - first if reviews > 1 else 0))
+        if reviews == 1:
+            self._bump("repeat_users", 1)
+        self.conn.execute(
+            "UPDATE user_progress SET reviews = reviews + 1, last_overall = ? WHERE user_id = ?",
+            (overall, user_id),
+        )
+
+    def record_roles(self, roles, job_id):
+        """Count roles suggested by !resume-role, once per job."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = []
+            for role in roles:
+                key = self._rollup_key("recommended", role.strip())
+                if key.casefold() not in [k.casefold() for k in keys]:
+                    keys.append(key)
+            cur = self.conn.execute(
+                "INSERT INTO role_suggestions (job_id, roles, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id) DO NOTHING",
+                (job_id, ", ".join(keys), time.time()),
+            )
+            if cur.rowcount:
+                for role in keys:
+                    self.conn.execute(
+                        "INSERT INTO rollup (dim, key, section, count, total) VALUES ('recommended', ?, 'count', 1, 0) "
+                        "ON CONFLICT (dim, key, section) DO UPDATE SET count = count + 1",
+                        (role,),
+                    )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _rollup_key(self, dim, key):
+        """Group keys case-insensitively, keeping the spelling first seen ("ML Engineer", "UI/UX Designer")."""
+        row = self.conn.execute(
+            "SELECT key FROM rollup WHERE dim = ? AND key = ? COLLATE NOCASE LIMIT 1", (dim, key)
+        ).fetchone()
+        return row[0] if row else key
+
+    def _bump(self, name, amount):
+        self.conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def averages(self, dim="all"):
+        """{key: {"count": reviews, section: average, ...}} for one dimension (all/type/batch/role)."""
+        result = {}
+        rows = self.conn.execute("SELECT key, section, count, total FROM rollup WHERE dim = ?", (dim,))
+        for key, section, count, total in rows:
+            entry = result.setdefault(key, {})
+            entry[section] = round(total / count, 1)
+            if section == "Overall":
+                entry["count"] = count
+        return result
+
+    def distribution(self, section="Overall"):
+        """Review counts in ten buckets: 0-9, 10-19, ..., 90-100."""
+        buckets = [0] * 10
+        for bucket, count in self.conn.execute(
+            "SELECT bucket, count FROM distribution WHERE section = ?", (section,)
+        ):
+            buckets[bucket] = count
+        return buckets
+
+    def improvement(self):
+        """Average change in Overall score between a user's first and latest review."""
+        counters = dict(self.conn.execute("SELECT name, value FROM counters"))
+        users = int(counters.get("repeat_users", 0))
+        average = counters.get("improvement_total", 0) / users if users else 0
+        return {"users": users, "average_change": round(average, 1)}
+
+    def top_roles(self, limit=5):
+        rows = self.conn.execute(
+            "SELECT key, count FROM rollup WHERE dim = 'recommended' AND section = 'count' "
+            "ORDER BY count DESC LIMIT ?",
+            (limit,),
+        )
+        return [(key, count) for key, count in rows]
+
+    def summary(self):
+        return {
+            "overall": self.averages("all").get("all", {}),
+            "by_type": self.averages("type"),
+            "by_batch": self.averages("batch"),
+            "by_role": self.averages("role"),
+            "distribution": self.distribution("Overall"),
+            "improvement": self.improvement(),
+            "top_recommended_roles": self.top_roles(),
+        }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Appended rather than prepended: the repo's email.py would otherwise shadow the stdlib email package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
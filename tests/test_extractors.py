@@ -0,0 +1,88 @@
+import zipfile
+import pytest
+import extractors
+from extractors import UnsupportedFormat, docx_xml, extract_text
+
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def p(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+def tc(*content):
+    return f"<w:tc>{''.join(content)}</w:tc>"
+
+def tr(*cells):
+    return f"<w:tr>{''.join(cells)}</w:tr>"
+
+def tbl(*rows):
+    return f"<w:tbl>{''.join(rows)}</w:tbl>"
+
+
+@pytest.fixture
+def make_docx(tmp_path):
+    def make(*body):
+        path = tmp_path / "resume.docx"
+        xml = f'<?xml version="1.0"?><w:document {NS}><w:body>{"".join(body)}</w:body></w:document>'
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("word/document.xml", xml)
+        return str(path)
+    return make
+
+
+def test_paragraphs_tabs_and_breaks(make_docx):
+    path = make_docx(
+        p("Jane Doe"),
+        "<w:p><w:r><w:t>Skills:</w:t><w:tab/><w:t>SQL</w:t><w:br/><w:t>Python</w:t></w:r></w:p>",
+    )
+    assert docx_xml(path) == "Jane Doe\nSkills:\tSQL\nPython"
+
+
+def test_table_rows_become_cell_lines(make_docx):
+    path = make_docx(
+        p("Education"),
+        tbl(
+            tr(tc(p("Degree")), tc(p("Year"))),
+            tr(tc(p("B.Sc"), p("Computer Science")), tc(p("2024"))),
+        ),
+        p("Projects"),
+    )
+    assert docx_xml(path) == "Education\nDegree | Year\nB.Sc Computer Science | 2024\nProjects"
+
+
+def test_nested_table_stays_in_its_cell(make_docx):
+    inner = tbl(tr(tc(p("Python")), tc(p("5 years"))))
+    path = make_docx(tbl(tr(tc(p("Skills")), tc(p("Languages"), inner))))
+    assert docx_xml(path) == "Skills | Languages Python | 5 years"
+
+
+def test_empty_rows_are_skipped(make_docx):
+    path = make_docx(tbl(tr(tc(p("")), tc(p(" "))), tr(tc(p("Name")), tc(p("Jane")))))
+    assert docx_xml(path) == "Name | Jane"
+
+
+def test_extract_text_rejects_unknown_format(tmp_path):
+    path = tmp_path / "resume.odt"
+    path.write_bytes(b"")
+    with pytest.raises(UnsupportedFormat):
+        extract_text(str(path))
+
+
+def test_extract_text_rejects_missing_backend(make_docx, monkeypatch):
+    monkeypatch.setitem(extractors._LIBRARIES, 'python-docx', None)
+    path = make_docx(p("Jane Doe"))
+
+    with pytest.raises(UnsupportedFormat, match="python-docx is not available"):
+        extract_text(path, backend='python-docx')
+    with pytest.raises(UnsupportedFormat, match="pymupdf is not available"):
+        extract_text(path, backend='pymupdf')
+    assert extract_text(path, backend='docx-xml') == "Jane Doe"
+
+
+def test_extract_text_falls_back_to_next_backend(make_docx, monkeypatch):
+    def broken(file_path, max_pages=None):
+        raise zipfile.BadZipFile("damaged")
+    monkeypatch.setitem(extractors.BACKENDS, '.docx', {'docx-xml': broken, 'fallback': docx_xml})
+    monkeypatch.setitem(extractors._FORCED, '.docx', '')
+
+    assert extract_text(make_docx(p("Jane Doe"))) == "Jane Doe"
@@ -0,0 +1,87 @@
+import time
+import pytest
+import job_queue
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"))
+
+
+def test_claim_returns_oldest_job_and_hides_it(queue):
+    first = queue.enqueue('resume', {'channel_id': 1})
+    queue.enqueue('askfile', {'channel_id': 2})
+
+    job = queue.claim()
+    assert job['id'] == first
+    assert job['attempts'] == 1
+    assert job['payload'] == {'channel_id': 1}
+
+    # The first job is leased, so the next claim gets the second one
+    assert queue.claim()['kind'] == 'askfile'
+    assert queue.claim() is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    queue.enqueue('resume', {'channel_id': 1})
+    job = queue.claim(visibility_timeout=-1)
+
+    again = queue.claim()
+    assert again['id'] == job['id']
+    assert again['attempts'] == 2
+
+
+def test_stale_complete_and_fail_do_nothing(queue):
+    queue.enqueue('resume', {'channel_id': 1}, max_attempts=3)
+    stale = queue.claim(visibility_timeout=-1)
+    current = queue.claim()
+
+    assert queue.complete(stale, "old result") == 0
+    assert queue.fail(stale, "old error") is None
+    assert queue.get(current['id'])['status'] == 'running'
+
+    assert queue.complete(current, "new result") == 1
+    job = queue.get(current['id'])
+    assert (job['status'], job['result']) == ('done', "new result")
+
+
+def test_fail_retries_with_backoff_then_gives_up(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, 'RETRY_DELAY', 10)
+    queue.enqueue('resume', {'channel_id': 1}, max_attempts=2)
+
+    job = queue.claim()
+    before = time.time()
+    assert queue.fail(job, "boom") == 'queued'
+    retried = queue.get(job['id'])
+    assert retried['status'] == 'queued'
+    assert retried['available_at'] >= before + 10
+    assert queue.claim() is None  # still backing off
+
+    queue.conn.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job['id'],))
+    job = queue.claim()
+    assert job['attempts'] == 2
+    assert queue.fail(job, "boom again", result="⚠️ failed") == 'failed'
+    failed = queue.get(job['id'])
+    assert (failed['status'], failed['result']) == ('failed', "⚠️ failed")
+
+
+def test_worker_lost_on_last_attempt_is_marked_failed(queue):
+    queue.enqueue('resume', {'channel_id': 1}, max_attempts=1)
+    job = queue.claim(visibility_timeout=-1)
+
+    assert queue.claim() is None
+    assert queue.get(job['id'])['status'] == 'failed'
+
+
+def test_finished_skips_awaited_jobs_and_delivered(queue):
+    posted = queue.enqueue('resume', {'channel_id': 1})
+    awaited = queue.enqueue('chat', {'message': "hi"})
+    for _ in range(2):
+        queue.complete(queue.claim(), "ok")
+
+    assert [job['id'] for job in queue.finished()] == [posted]
+    assert queue.get(awaited)['status'] == 'done'
+
+    queue.mark_delivered(posted)
+    assert queue.finished() == []
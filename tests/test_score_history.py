@@ -0,0 +1,99 @@
+import pytest
+from score_history import ScoreHistory, parse_scores, parse_role
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = ScoreHistory(str(tmp_path / "scores.db"))
+    yield history
+    history.close()
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Objective: 70/100", {"Objective": 70}),
+    ("- **Skills:** 85 / 100", {"Skills": 85}),
+    ("1. Objective: 70/100", {"Objective": 70}),
+    ("1. **Objective:** 70/100", {"Objective": 70}),
+    ("1. **Objective**: 70/100", {"Objective": 70}),
+    ("**Overall: 64/100**", {"Overall": 64}),
+    ("Scores from 0 to 100 (Overall: 0–100)", {}),
+    ("Experience: 120/100", {}),
+    ("The Experience section: 40/100 could improve", {}),
+])
+def test_parse_scores(line, expected):
+    assert parse_scores(line) == expected
+
+
+def test_parse_scores_keeps_first_value_per_section():
+    assert parse_scores("Overall: 60/100\nOverall: 90/100") == {"Overall": 60}
+
+
+@pytest.mark.parametrize("line", [
+    "Best Recommended Role: Data Analyst",
+    "2. Best Recommended Role: Data Analyst",
+    "2. **Best Recommended Role:** Data Analyst",
+    "2. **Best Recommended Role**: Data Analyst.",
+    "- **Best Recommended Role:** **Data Analyst**",
+])
+def test_parse_role(line):
+    assert parse_role(line) == "Data Analyst"
+
+
+def test_parse_role_missing():
+    assert parse_role("Key Strengths: SQL") is None
+
+
+def test_rollup_averages(history):
+    history.record({"Overall": 60, "Skills": 80}, user_type="Student", batch="2024", role="Data Analyst", job_id=1)
+    history.record({"Overall": 71, "Skills": "N/A"}, user_type="student", batch="2025", role="data analyst", job_id=2)
+    history.record({"Overall": 90}, user_type="Alumni", batch="2024", job_id=3)
+
+    assert history.averages("all") == {"all": {"count": 3, "Overall": 73.7, "Skills": 80.0}}
+    assert history.averages("type") == {
+        "student": {"count": 2, "Overall": 65.5, "Skills": 80.0},
+        "alumni": {"count": 1, "Overall": 90.0},
+    }
+    assert history.averages("batch")["2024"] == {"count": 2, "Overall": 75.0, "Skills": 80.0}
+    assert history.averages("role") == {"Data Analyst": {"count": 2, "Overall": 65.5, "Skills": 80.0}}
+
+
+def test_distribution_buckets(history):
+    for job_id, overall in enumerate([5, 59, 50, 100, 99]):
+        history.record({"Overall": overall}, job_id=job_id)
+
+    assert history.distribution("Overall") == [1, 0, 0, 0, 0, 2, 0, 0, 0, 2]
+    assert history.distribution("Skills") == [0] * 10
+
+
+def test_improvement_uses_first_and_latest_review(history):
+    history.record({"Overall": 50}, user_id=1, job_id=1)
+    assert history.improvement() == {"users": 0, "average_change": 0}
+
+    history.record({"Overall": 60}, user_id=1, job_id=2)
+    history.record({"Overall": 80}, user_id=1, job_id=3)
+    history.record({"Overall": 70}, user_id=2, job_id=4)
+    history.record({"Overall": 65}, user_id=2, job_id=5)
+    # user 1: 80 - 50 = 30, user 2: 65 - 70 = -5
+    assert history.improvement() == {"users": 2, "average_change": 12.5}
+
+
+def test_same_job_is_recorded_once(history):
+    assert history.record({"Overall": 60}, user_id=1, job_id=7) is not None
+    assert history.record({"Overall": 60}, user_id=1, job_id=7) is None
+
+    assert history.averages("all")["all"]["count"] == 1
+    assert history.distribution("Overall")[6] == 1
+    assert history.improvement()["users"] == 0
+
+
+def test_record_without_scores_is_skipped(history):
+    assert history.record({"Overall": "N/A"}, job_id=1) is None
+    assert history.averages("all") == {}
+
+
+def test_roles_group_case_insensitively_and_keep_spelling(history):
+    history.record_roles(["ML Engineer", "UI/UX Designer", " ml engineer "], job_id=1)
+    history.record_roles(["ml engineer", "Data Analyst"], job_id=2)
+    history.record_roles(["ml engineer"], job_id=2)  # same job again
+
+    assert dict(history.top_roles()) == {"ML Engineer": 2, "UI/UX Designer": 1, "Data Analyst": 1}
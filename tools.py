@@ -0,0 +1,19 @@
+from deep_translator import GoogleTranslator
+import ollama
+
+
+# Translate
+def translate(text, target_lang='en', source_lang='auto'):
+    return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+
+# Ask LLM
+def ask_llm(prompt, image_paths=None):
+    try:
+        messages = [{"role": "user", "content": prompt}]
+        if image_paths:
+            messages[0]["images"] = image_paths
+        response = ollama.chat(model='llava:7b', messages=messages)
+        return response['message']['content'] if 'message' in response else "⚠️ LLM response error."
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
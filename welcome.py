@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+
+# Load ENV
+load_dotenv()
+WELCOME_WINDOW = float(os.getenv("WELCOME_WINDOW", "10"))  # seconds to collect joins before welcoming
+WELCOME_MAX_BATCH = int(os.getenv("WELCOME_MAX_BATCH", "40"))  # keeps the mention list under Discord's 2000 chars
+
+log = logging.getLogger("careermate.welcome")
+
+
+class WelcomeBatcher:
+    """Merges member joins per guild into one welcome message.
+
+    The first join in a guild starts a WELCOME_WINDOW timer; the batch is sent
+    when it fires or as soon as WELCOME_MAX_BATCH members are waiting.
+    send(guild, members) is the coroutine that posts the welcome.
+    """
+
+    def __init__(self, send, window=WELCOME_WINDOW, max_batch=WELCOME_MAX_BATCH):
+        self.send = send
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}  # guild_id -> [member, ...]
+        self._timers = {}   # guild_id -> asyncio.TimerHandle
+        self._tasks = set()
+
+    def add(self, member):
+        guild_id = member.guild.id
+        batch = self._pending.setdefault(guild_id, [])
+        batch.append(member)
+
+        if len(batch) >= self.max_batch:
+            self.flush(guild_id)
+        elif guild_id not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[guild_id] = loop.call_later(self.window, self.flush, guild_id)
+
+    def flush(self, guild_id):
+        timer = self._timers.pop(guild_id, None)
+        if timer:
+            timer.cancel()
+        members = self._pending.pop(guild_id, [])
+        if not members:
+            return
+
+        task = asyncio.create_task(self._send(members))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, members):
+        try:
+            await self.send(members[0].guild, members)
+        except Exception as e:
+            log.exception(f"Failed to send welcome for {len(members)} members: {e}")
@@ -0,0 +1,203 @@
+import logging
+import multiprocessing
+import os
+import time
+from job_queue import JobQueue
+from tools import translate, ask_llm
+from extractors import extract_text
+from log_config import setup_logging, request_id
+from score_history import ScoreHistory, parse_scores, parse_role
+
+# Workers mostly wait on the LLM and translator, so running more of them than CPU cores is fine
+WORKER_COUNT = int(os.getenv("WORKER_COUNT", "2"))
+POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+
+log = logging.getLogger("careermate.worker")
+
+# Opened per worker process in work()
+history = None
+
+RESUME_PROMPT = """
+You are a professional resume reviewer.
+
+Analyze the resume below and provide:
+
+1. Scores from 0 to 100, one per line, in exactly this format (NN is the score):
+Objective: NN/100
+Experience: NN/100
+Projects: NN/100
+Skills: NN/100
+Education: NN/100
+Certifications: NN/100
+Overall: NN/100
+
+2. Best Recommended Role: <1 job title only>
+
+3. Key Strengths (3 bullet points)
+
+4. Key Weaknesses (3 bullet points)
+
+5. Suggestions to improve each section
+
+Resume:
+{text}
+"""
+
+TOP_ROLE_PROMPT = (
+    "From the resume text below, list only the **single most suitable job role** for this user. "
+    "Return just the role name, no extra explanation.\n\n"
+    "Resume:\n{text}"
+)
+
+ROLES_PROMPT = (
+    "From the resume text below, list 3 to 5 most suitable job roles for this user. "
+    "Return the roles as a comma-separated list only, without any explanation.\n\n"
+    "Resume:\n{text}"
+)
+
+# Message posted when a job runs out of retries
+FAILURE_MESSAGES = {
+    'resume': "⚠️ Error analyzing resume: {error}",
+    'resume_role': "⚠️ Error while processing the resume: `{error}`",
+    'askfile': "⚠️ Error while processing the file: `{error}`",
+}
+
+
+def llm(prompt):
+    # ask_llm reports errors as text; raise instead so the queue retries the job
+    response = ask_llm(prompt)
+    if response.startswith("❌ Error:"):
+        raise RuntimeError(response)
+    return response
+
+
+# Extraction errors (missing or unreadable file) raise, so the queue retries the job
+# job_id lets the score history ignore a job that runs again after a retry or lost lease
+def run_resume(payload, job_id):
+    text = extract_text(payload['file_path'])
+    if not text.strip():
+        return "⚠️ Could not extract text from the resume."
+
+    result = llm(RESUME_PROMPT.format(text=text[:3000]))
+    # Score history is best-effort: the user still gets the review if the write fails
+    try:
+        history.record(
+            parse_scores(result),
+            user_id=payload.get('user_id'),
+            user_name=payload['author_name'],
+            user_type=payload.get('user_type'),
+            batch=payload.get('batch'),
+            role=parse_role(result),
+            job_id=job_id,
+        )
+    except Exception:
+        log.exception(f"Could not record scores for job #{job_id}")
+    return f"📄 **Resume Review for `{payload['author_name']}`**\n\n{result}"
+
+
+def run_resume_role(payload, job_id):
+    text = extract_text(payload['file_path'])
+    if not text.strip():
+        return "⚠️ Couldn't extract content from your resume."
+
+    response = llm(ROLES_PROMPT.format(text=text[:3000]))
+    roles = [r.strip() for r in response.split(",") if r.strip()]
+    if not roles:
+        return "⚠️ No roles identified from the resume."
+    try:
+        history.record_roles(roles, job_id)
+    except Exception:
+        log.exception(f"Could not record roles for job #{job_id}")
+
+    formatted_roles = "\n".join(f"🔹 {role}" for role in roles)
+    return f"🎯 **Top Recommended Roles for You, {payload['author_mention']}:**\n{formatted_roles}"
+
+
+def run_askfile(payload, job_id):
+    text = extract_text(payload['file_path'])
+    if not text.strip():
+        return "⚠️ Could not extract text from the file."
+
+    response = llm(translate(text))
+    return f"🧠 CareerMate:\n{response}"
+
+
+# Awaited by the join/apply conversations; an empty result means no text was found
+def run_top_role(payload, job_id):
+    text = extract_text(payload['file_path'])
+    if not text.strip():
+        return ""
+
+    return llm(TOP_ROLE_PROMPT.format(text=text[:3000])).strip().split("\n")[0]
+
+
+# Awaited by !bot
+def run_chat(payload, job_id):
+    return llm(translate(payload['message'], 'en'))
+
+
+HANDLERS = {
+    'resume': run_resume,
+    'resume_role': run_resume_role,
+    'askfile': run_askfile,
+    'top_role': run_top_role,
+    'chat': run_chat,
+}
+
+
+def cleanup(payload):
+    if payload.get('remove_file') and os.path.exists(payload['file_path']):
+        os.remove(payload['file_path'])
+
+
+def work(worker_id):
+    global history
+    setup_logging(f"worker-{worker_id}")
+    queue = JobQueue()
+    history = ScoreHistory()
+    log.info(f"✅ Worker {worker_id} started (pid {os.getpid()})")
+
+    while True:
+        job = queue.claim()
+        if job is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        kind, payload = job['kind'], job['payload']
+        request_id.set(job['payload'].get('request_id') or f"job-{job['id']}")
+        log.info(f"[JOB] Worker {worker_id} running #{job['id']} ({kind}, attempt {job['attempts']})")
+        try:
+            result = HANDLERS[kind](payload, job['id'])
+        except Exception as e:
+            message = FAILURE_MESSAGES.get(kind, "⚠️ Error: {error}").format(error=e)
+            outcome = queue.fail(job, str(e), result=message)
+            if outcome == 'queued':
+                log.warning(f"[RETRY] Job #{job['id']} failed, will retry: {e}")
+            elif outcome == 'failed':
+                log.error(f"Job #{job['id']} gave up after {job['attempts']} attempts: {e}")
+                cleanup(payload)
+            else:
+                log.warning(f"Job #{job['id']} lease expired, another attempt owns it: {e}")
+            continue
+
+        # Leave the file alone if the lease expired: the newer attempt still needs it
+        if queue.complete(job, result):
+            cleanup(payload)
+        else:
+            log.warning(f"Job #{job['id']} lease expired before it finished, result dropped")
+
+
+def main():
+    processes = [multiprocessing.Process(target=work, args=(i,)) for i in range(WORKER_COUNT)]
+    for p in processes:
+        p.start()
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        for p in processes:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()